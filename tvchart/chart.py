@@ -1,15 +1,70 @@
 from __future__ import annotations
 
+import copy
 import os
+from collections import defaultdict
+from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import orjson
+import pandas as pd
 from dateutil import parser
-from jinja2 import ChainableUndefined, Environment, FileSystemLoader
+from jinja2 import ChainableUndefined, Environment, FileSystemLoader, Template
 from pytz import UTC
 
 
+# Minimal orjson flag set used by every dumps call; OPT_SERIALIZE_NUMPY is
+# free for pure-Python input and lets numpy scalars/arrays pass through.
+_OJ_OPTS = orjson.OPT_SERIALIZE_NUMPY
+
+_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+# autoescape stays off on purpose: the templates interpolate large trusted
+# JSON payloads into <script> blocks, and HTML-escaping them character by
+# character would both corrupt the JS and be very slow.
+_JINJA_ENV = Environment(
+    loader=FileSystemLoader(_TEMPLATE_DIR),
+    undefined=ChainableUndefined,
+    autoescape=False,
+    auto_reload=False,
+    cache_size=-1,
+)
+
+_TEMPLATES: Dict[str, Template] = {
+    name: _JINJA_ENV.get_template(name)
+    for name in (
+        "actions/add_series.html",
+        "actions/add_series_batch.html",
+        "actions/add_priceline.html",
+        "actions/add_markers.html",
+        "index.html",
+    )
+}
+
+
+_DEFAULT_MARKER_OPTS: Dict[str, str] = {
+    "color": "red",
+    "shape": "arrowUp",
+    "position": "belowBar",
+}
+
+
+def _parse_ts(x: Any, _fi=datetime.fromisoformat, _pp=parser.parse) -> int:
+    """
+    Parse a single timestamp to UTC epoch seconds, trying the C-accelerated
+    datetime.fromisoformat before falling back to dateutil's grammar parser.
+    """
+    try:
+        d = _fi(x)
+    except (TypeError, ValueError):
+        d = _pp(x)
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=UTC)
+    return int(d.timestamp())
+
+
 class TVSeriesType(str, Enum):
     # https://tradingview.github.io/lightweight-charts/docs/series-types
     Area = "Area"
@@ -30,22 +85,68 @@ class TVChart:
             chart_options (Dict[str, Any], optional): _description_. Defaults to None.
         """
         if mode.lower().strip() == "interday":
-            if chart_options is None:
-                chart_options = {}
-            chart_options["timeScale"] = {"timeVisible": True, "secondsVisible": False}
+            # Copy so the caller's dict is never mutated, and use setdefault
+            # so an explicit timeScale from the caller wins.
+            chart_options = dict(chart_options) if chart_options else {}
+            chart_options.setdefault(
+                "timeScale", {"timeVisible": True, "secondsVisible": False}
+            )
 
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(os.path.dirname(__file__) + os.sep + "templates"),
-            undefined=ChainableUndefined,
-        )
+        self.jinja_env = _JINJA_ENV
+        self._templates: Dict[str, Template] = _TEMPLATES
         self.time_series = None
         self.chart_options = chart_options
-        self.series_markers: Dict[str, List[Dict[Any, Any]]] = {}
+        self.series_markers: Dict[str, List[Dict[Any, Any]]] = defaultdict(list)
         self.legend_html = None
-        self.__drawings = []
+        self.__drawings: List[bytes] = []
+        self._opts_json_cache: Dict[Any, Tuple[Optional[Dict[str, Any]], str]] = {}
 
     def __fill_template(self, template: str, params: Dict[str, Any] = {}) -> str:
-        return self.jinja_env.get_template(template).render(params)
+        tpl = self._templates.get(template)
+        if tpl is None:
+            tpl = self._templates[template] = self.jinja_env.get_template(template)
+        return tpl.render(params)
+
+    def __add_drawing(self, template: str, params: Dict[str, Any]) -> None:
+        # Drawings are kept as UTF-8 bytes so html()/save() can join and
+        # write them without re-encoding each fragment.
+        self.__drawings.append(self.__fill_template(template, params).encode("utf-8"))
+
+    def __options_json(
+        self, options: Optional[Dict[str, Any]], pane: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Serialize an options dict once and reuse the JSON on repeat calls
+        with the same contents (and pane). A deep snapshot of the dict is
+        kept in the cache value and compared on every hit, so in-place
+        mutation (or a recycled id) re-serializes instead of serving stale
+        JSON.
+        """
+        if not options and pane is None:
+            return None
+        key = (id(options), pane)
+        cached = self._opts_json_cache.get(key)
+        if cached is not None and cached[0] == options:
+            return cached[1]
+        merged = dict(options) if options else {}
+        if pane is not None:
+            merged["pane"] = pane
+        rendered = orjson.dumps(merged, option=_OJ_OPTS).decode("utf-8")
+        snapshot = copy.deepcopy(options) if options else None
+        self._opts_json_cache[key] = (snapshot, rendered)
+        return rendered
+
+    def __extend_markers(
+        self, name: str, pairs: Any, options: Optional[Dict[str, str]]
+    ) -> None:
+        base = dict(_DEFAULT_MARKER_OPTS if options is None else options)
+        markers = []
+        for tt, txt in pairs:
+            d = base.copy()
+            d["time"] = tt
+            d["text"] = txt
+            markers.append(d)
+        self.series_markers[name].extend(markers)
 
     def set_legend_html(self, html: str) -> TVChart:
         """
@@ -87,42 +188,79 @@ class TVChart:
         Returns:
             TVRenderer: self
         """
-        self.time_series = [
-            int(parser.parse(x).replace(tzinfo=UTC).timestamp()) for x in t
-        ]
+        t_arr = np.asarray(t)
+        if t_arr.dtype.kind in "iuf":
+            # Numeric input is already epoch seconds (TradingView's native
+            # time format); pandas would misread it as nanoseconds.
+            self.time_series = t_arr.astype(np.int64)
+        else:
+            try:
+                self.time_series = (
+                    pd.to_datetime(t, utc=True, format="mixed")
+                    .as_unit("s")
+                    .astype("int64")
+                    .to_numpy()
+                )
+            except (ValueError, TypeError):
+                # pandas could not infer every element; parse row by row with
+                # the fromisoformat fast path.
+                self.time_series = np.fromiter(
+                    map(_parse_ts, t), dtype=np.int64, count=len(t)
+                )
+        times = self.time_series.tolist()
+        # orjson cannot serialize structured dtypes, so rows stay as dicts;
+        # coercing each column through numpy once keeps the per-row values
+        # plain floats regardless of whether callers pass lists, ndarrays or
+        # pandas Series.
+        o = np.asarray(o, dtype=np.float64).tolist()
+        h = np.asarray(h, dtype=np.float64).tolist()
+        l = np.asarray(l, dtype=np.float64).tolist()
+        c = np.asarray(c, dtype=np.float64).tolist()
+        for col_name, col in (("o", o), ("h", h), ("l", l), ("c", c)):
+            if len(col) != len(times):
+                raise ValueError(
+                    f"column '{col_name}' has {len(col)} rows but 't' has "
+                    f"{len(times)}"
+                )
+        # Index directly instead of zipping: no intermediate 5-tuple per row.
         ohlc_data = orjson.dumps(
             [
-                {"time": x[0], "open": x[1], "high": x[2], "low": x[3], "close": x[4]}
-                for x in zip(self.time_series, o, h, l, c)
-            ]
+                {
+                    "time": times[i],
+                    "open": o[i],
+                    "high": h[i],
+                    "low": l[i],
+                    "close": c[i],
+                }
+                for i in range(len(times))
+            ],
+            option=_OJ_OPTS,
         ).decode("utf-8")
 
-        self.__drawings.append(
-            self.__fill_template(
-                "actions/add_series.html",
-                {
-                    "type": TVSeriesType.Candlestick.value,
-                    "series_name": "ohlc",
-                    "options": ohlc_options,
-                    "data": ohlc_data,
-                },
-            )
+        self.__add_drawing(
+            "actions/add_series.html",
+            {
+                "type": TVSeriesType.Candlestick.value,
+                "series_name": "ohlc",
+                "options_json": self.__options_json(ohlc_options),
+                "data": ohlc_data,
+            },
         )
 
-        if v:
+        if v is not None and len(v) > 0:
+            v = np.asarray(v, dtype=np.float64).tolist()
+            if len(v) != len(times):
+                raise ValueError(
+                    f"column 'v' has {len(v)} rows but 't' has {len(times)}"
+                )
             vdata = orjson.dumps(
-                [
-                    {
-                        "time": x[0],
-                        "value": x[1],
-                    }
-                    for x in zip(self.time_series, v)
-                ]
+                [{"time": times[i], "value": v[i]} for i in range(len(v))],
+                option=_OJ_OPTS,
             ).decode("utf-8")
 
-            if not isinstance(volume_options, dict):
-                volume_options = {}
-
+            volume_options = (
+                dict(volume_options) if isinstance(volume_options, dict) else {}
+            )
             volume_options["priceFormat"] = {"type": "volume"}
             volume_options["priceScaleId"] = ""
             if "scaleMargins" not in volume_options:
@@ -130,16 +268,16 @@ class TVChart:
             if "color" not in volume_options:
                 volume_options["color"] = "#26a69a"
 
-            self.__drawings.append(
-                self.__fill_template(
-                    "actions/add_series.html",
-                    {
-                        "type": TVSeriesType.Histogram.value,
-                        "series_name": "volume",
-                        "options": volume_options,
-                        "data": vdata,
-                    },
-                )
+            self.__add_drawing(
+                "actions/add_series.html",
+                {
+                    "type": TVSeriesType.Histogram.value,
+                    "series_name": "volume",
+                    "options_json": orjson.dumps(
+                        volume_options, option=_OJ_OPTS
+                    ).decode("utf-8"),
+                    "data": vdata,
+                },
             )
 
         return self
@@ -166,30 +304,28 @@ class TVChart:
             TVRenderer: self
         """
         if not isinstance(options, dict):
-            options = {}
-        options["pane"] = pane
+            options = None
+        vals = np.asarray(series, dtype=np.float64)
+        if len(vals) != len(self.time_series):
+            raise ValueError(
+                f"series '{name}' has {len(vals)} points but the time axis "
+                f"has {len(self.time_series)}"
+            )
+        mask = ~np.isnan(vals)
+        times = self.time_series[mask].tolist()
+        vals = vals[mask].tolist()
         data = orjson.dumps(
-            [
-                {
-                    "time": x[0],
-                    "value": x[1],
-                }
-                for x in filter(
-                    lambda i: i[1] is not None,
-                    zip(self.time_series, series),
-                )
-            ]
+            [{"time": x[0], "value": x[1]} for x in zip(times, vals)],
+            option=_OJ_OPTS,
         ).decode("utf-8")
-        self.__drawings.append(
-            self.__fill_template(
-                "actions/add_series.html",
-                {
-                    "type": type.value,
-                    "series_name": name,
-                    "options": options,
-                    "data": data,
-                },
-            )
+        self.__add_drawing(
+            "actions/add_series.html",
+            {
+                "type": type.value,
+                "series_name": name,
+                "options_json": self.__options_json(options, pane),
+                "data": data,
+            },
         )
         return self
 
@@ -227,13 +363,12 @@ class TVChart:
                 "lineStyle": line_style,
                 "axisLabelVisible": axis_label_visiable,
                 "title": title,
-            }
+            },
+            option=_OJ_OPTS,
         ).decode("utf-8")
-        self.__drawings.append(
-            self.__fill_template(
-                "actions/add_priceline.html",
-                {"series_name": name, "data": data},
-            )
+        self.__add_drawing(
+            "actions/add_priceline.html",
+            {"series_name": name, "data": data},
         )
         return self
 
@@ -241,11 +376,7 @@ class TVChart:
         self,
         name: str,
         idx_dict: Dict[int, str],
-        options: Dict[str, str] = {
-            "color": "red",
-            "shape": "arrowUp",
-            "position": "belowBar",
-        },
+        options: Optional[Dict[str, str]] = None,
     ) -> TVChart:
         """
         Add Markers to series
@@ -258,21 +389,19 @@ class TVChart:
         Returns:
             TVRenderer: self
         """
-        return self.add_markers_by_time(
-            name=name,
-            time_dict={self.time_series[k]: v for k, v in idx_dict.items()},
-            options=options,
+        idxs = np.fromiter(idx_dict.keys(), dtype=np.intp, count=len(idx_dict))
+        self.__extend_markers(
+            name,
+            zip(self.time_series[idxs].tolist(), idx_dict.values()),
+            options,
         )
+        return self
 
     def add_markers_by_time(
         self,
         name: str,
         time_dict: Dict[Any, str],
-        options: Dict[str, str] = {
-            "color": "red",
-            "shape": "arrowUp",
-            "position": "belowBar",
-        },
+        options: Optional[Dict[str, str]] = None,
     ) -> TVChart:
         """
         Similer to add marker by index
@@ -285,10 +414,7 @@ class TVChart:
         Returns:
             TVRenderer: _description_
         """
-        self.series_markers[name] = self.series_markers.get(name, [])
-        self.series_markers[name] += [
-            {"time": k, "text": v, **options} for k, v in time_dict.items()
-        ]
+        self.__extend_markers(name, time_dict.items(), options)
         return self
 
     def add_lines_by_idx(
@@ -312,13 +438,13 @@ class TVChart:
         Returns:
             TVRenderer: _description_
         """
+        lines = np.asarray(idx_lines, dtype=np.float64).reshape(-1, 4)
+        x1 = self.time_series[lines[:, 0].astype(np.intp)].tolist()
+        x2 = self.time_series[lines[:, 2].astype(np.intp)].tolist()
         return self.add_lines_by_time(
             name=name,
             pane=pane,
-            time_lines=[
-                (self.time_series[x1], y1, self.time_series[x2], y2)
-                for x1, y1, x2, y2 in idx_lines
-            ],
+            time_lines=list(zip(x1, lines[:, 1].tolist(), x2, lines[:, 3].tolist())),
             type=type,
             options=options,
         )
@@ -332,44 +458,61 @@ class TVChart:
         options: Dict[str, Any] = None,
     ) -> TVChart:
         if not isinstance(options, dict):
-            options = {}
-        for idx, [x1, y1, x2, y2] in enumerate(time_lines):
-            data = orjson.dumps(
+            options = None
+        # All segments share one options dict, so serialize it a single time
+        # and hand the template the raw JSON.
+        options_json = self.__options_json(options, pane)
+        segments = orjson.dumps(
+            [
                 [{"time": x1, "value": y1}, {"time": x2, "value": y2}]
-            ).decode("utf-8")
-            options["pane"] = pane
-            self.__drawings.append(
-                self.__fill_template(
-                    "actions/add_series.html",
-                    {
-                        "type": type.value,
-                        "series_name": f"{name}{idx}",
-                        "options": options,
-                        "data": data,
-                    },
-                )
-            )
+                for x1, y1, x2, y2 in time_lines
+            ],
+            option=_OJ_OPTS,
+        ).decode("utf-8")
+        self.__add_drawing(
+            "actions/add_series_batch.html",
+            {
+                "type": type.value,
+                "options_json": options_json,
+                "segments": segments,
+            },
+        )
         return self
 
-    def html(self) -> str:
+    def __index_params(self) -> Dict[str, Any]:
         for name, data in self.series_markers.items():
-            self.__drawings.append(
-                self.__fill_template(
-                    "actions/add_markers.html",
-                    {"series_name": name, "data": orjson.dumps(data).decode("utf-8")},
-                )
+            self.__add_drawing(
+                "actions/add_markers.html",
+                {
+                    "series_name": name,
+                    "data": orjson.dumps(data, option=_OJ_OPTS).decode("utf-8"),
+                },
+            )
+        return {
+            "chart_options": self.chart_options,
+            "legend_html": self.legend_html,
+            "drawings": (d.decode("utf-8") for d in self.__drawings),
+        }
+
+    def html(self) -> str:
+        return self.__fill_template("index.html", self.__index_params())
+
+    def html_bytes(self) -> bytes:
+        """
+        Render the page as UTF-8 bytes for consumers that write to disk or
+        an HTTP response, skipping the full-string encode pass of html().
+        """
+        return b"".join(
+            chunk.encode("utf-8")
+            for chunk in self._templates["index.html"].generate(
+                self.__index_params()
             )
-        content = self.__fill_template(
-            "index.html",
-            {
-                "chart_options": self.chart_options,
-                "legend_html": self.legend_html,
-                "drawings": "\n\n".join(self.__drawings),
-            },
         )
-        return content
 
     def save(self, file_path: str):
-        content = self.html()
-        with open(file_path, "w") as f:
-            f.write(content)
+        # Stream the index template straight to disk so the full page is
+        # never materialized as one string.
+        with open(file_path, "wb", buffering=1 << 20) as f:
+            self._templates["index.html"].stream(self.__index_params()).dump(
+                f, encoding="utf-8"
+            )